@@ -36,8 +36,7 @@ def create_simple_network():
     server2 = Host("DBServer")
     
     # Add all devices to the network
-    for device in [router1, router2, switch1, switch2, pc1, pc2, server1, server2]:
-        network.add_device(device)
+    network.add_devices([router1, router2, switch1, switch2, pc1, pc2, server1, server2])
     
     # ===== Network Segments =====
     # - 192.168.1.0/24: R1's LAN (PC1, PC2)
@@ -1,25 +1,43 @@
+import sys
+
+# Interned device type names, so type checks can compare by identity
+ROUTER = sys.intern('router')
+SWITCH = sys.intern('switch')
+HOST = sys.intern('host')
+
+
+class Interface:
+    """Network interface configuration."""
+    
+    __slots__ = ('status', 'ip_address', 'subnet_mask', 'mac_address', 'connected_to')
+    
+    def __init__(self, status='down', ip_address=None, subnet_mask=None,
+                 mac_address=None, connected_to=None):
+        self.status = status  # 'up' or 'down'
+        self.ip_address = ip_address
+        self.subnet_mask = subnet_mask
+        self.mac_address = mac_address
+        self.connected_to = connected_to
+
+
 class Device:
+    __slots__ = ('name', 'device_type', 'interfaces', 'attributes')
+    
     def __init__(self, name, device_type, **kwargs):
         self.name = name
-        self.device_type = device_type
+        self.device_type = sys.intern(device_type.lower())
         self.interfaces = {}
         self.attributes = kwargs
         
     def add_interface(self, interface_name, **kwargs):
         """Add a network interface to the device."""
-        self.interfaces[interface_name] = {
-            'status': 'down',  # 'up' or 'down'
-            'ip_address': None,
-            'subnet_mask': None,
-            'mac_address': None,
-            **kwargs
-        }
+        self.interfaces[interface_name] = Interface(**kwargs)
     
     def set_interface_status(self, interface_name, status):
         """Set the status of an interface (up/down)."""
         if interface_name in self.interfaces:
             if status.lower() in ['up', 'down']:
-                self.interfaces[interface_name]['status'] = status.lower()
+                self.interfaces[interface_name].status = status.lower()
                 return True
         return False
     
@@ -31,8 +49,10 @@ class Device:
 class Router(Device):
     """Router network device."""
     
+    __slots__ = ('routing_table',)
+    
     def __init__(self, name, **kwargs):
-        super().__init__(name, 'router', **kwargs)
+        super().__init__(name, ROUTER, **kwargs)
         self.routing_table = {}
     
     def add_route(self, network, next_hop, interface, metric=1):
@@ -47,8 +67,10 @@ class Router(Device):
 class Switch(Device):
     """Switch network device."""
     
+    __slots__ = ('mac_table',)
+    
     def __init__(self, name, **kwargs):
-        super().__init__(name, 'switch', **kwargs)
+        super().__init__(name, SWITCH, **kwargs)
         self.mac_table = {}  # MAC address to port mapping
     
     def learn_mac(self, mac_address, port):
@@ -59,8 +81,10 @@ class Switch(Device):
 class Host(Device):
     """Host (end device) network device."""
     
+    __slots__ = ('running_processes',)
+    
     def __init__(self, name, **kwargs):
-        super().__init__(name, 'host', **kwargs)
+        super().__init__(name, HOST, **kwargs)
         self.running_processes = []
     
     def start_process(self, process_name, **kwargs):
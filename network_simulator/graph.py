@@ -0,0 +1,138 @@
+from collections import namedtuple
+
+# Link attributes, oriented from device1 to device2 as passed to add_edge
+Link = namedtuple('Link', 'device1 device2 interface1 interface2 bandwidth description extra')
+
+
+class NodeView(dict):
+    """Mapping of node name to node attributes, also callable like networkx's G.nodes()."""
+
+    def __call__(self, data=False):
+        if data is False:
+            return list(self)
+        if data is True:
+            return list(self.items())
+        return [(node, attrs.get(data)) for node, attrs in self.items()]
+
+
+class AdjGraph:
+    """
+    Undirected adjacency-list graph specialized for network topologies.
+
+    Each link keeps its two interface names, bandwidth and description in a
+    single tuple instead of a per-edge attribute dict. Exposes the subset of
+    the networkx Graph API used by the simulator.
+    """
+
+    __slots__ = ('nodes', 'adj', 'edge_attrs')
+
+    def __init__(self):
+        self.nodes = NodeView()  # name -> node attributes
+        self.adj = {}            # name -> list of neighbor names
+        self.edge_attrs = {}     # frozenset({u, v}) -> Link
+
+    def add_node(self, node, **attrs):
+        """Add a node, or update the attributes of an existing one."""
+        if node in self.nodes:
+            self.nodes[node].update(attrs)
+        else:
+            self.nodes[node] = attrs
+            self.adj[node] = []
+
+    def add_nodes_from(self, nodes):
+        """Add nodes from an iterable of (node, attrs) pairs."""
+        for node, attrs in nodes:
+            self.add_node(node, **attrs)
+
+    def remove_node(self, node):
+        """Remove a node and all of its links."""
+        for nbr in self.adj.pop(node):
+            if nbr != node:
+                self.adj[nbr].remove(node)
+            del self.edge_attrs[frozenset((node, nbr))]
+        del self.nodes[node]
+
+    def add_edge(self, u, v, interface1=None, interface2=None, bandwidth=None,
+                 description=None, **extra):
+        """Add a link from u to v, replacing the attributes of an existing one."""
+        for node in (u, v):
+            if node not in self.nodes:
+                self.add_node(node)
+
+        key = frozenset((u, v))
+        if key not in self.edge_attrs:
+            self.adj[u].append(v)
+            if u != v:
+                self.adj[v].append(u)
+        self.edge_attrs[key] = Link(u, v, interface1, interface2, bandwidth, description, extra or None)
+
+    def has_edge(self, u, v):
+        """Return True if u and v are linked."""
+        return frozenset((u, v)) in self.edge_attrs
+
+    def has_node(self, node):
+        """Return True if the node exists."""
+        return node in self.nodes
+
+    def neighbors(self, node):
+        """Iterate over the neighbors of a node."""
+        return iter(self.adj[node])
+
+    def get_link(self, u, v):
+        """Return the Link between u and v, or None if they are not linked."""
+        return self.edge_attrs.get(frozenset((u, v)))
+
+    @staticmethod
+    def _link_data(link):
+        """Build a networkx-style attribute dict for a link."""
+        data = {}
+        if link.interface1 is not None:
+            data['interface1'] = link.interface1
+        if link.interface2 is not None:
+            data['interface2'] = link.interface2
+        if link.bandwidth is not None:
+            data['bandwidth'] = link.bandwidth
+        if link.description is not None:
+            data['description'] = link.description
+        if link.extra:
+            data.update(link.extra)
+        return data
+
+    def links(self):
+        """Return all Link tuples."""
+        return self.edge_attrs.values()
+
+    def edges(self, data=False):
+        """
+        Return the links as (u, v) pairs, or (u, v, attrs) triples when data is True.
+
+        Each link is reported once, oriented as it was added.
+        """
+        if data:
+            return [(link.device1, link.device2, self._link_data(link))
+                    for link in self.edge_attrs.values()]
+        return [(link.device1, link.device2) for link in self.edge_attrs.values()]
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        return len(self.edge_attrs)
+
+    def to_networkx(self):
+        """Build an equivalent networkx Graph, e.g. for layout and drawing."""
+        import networkx as nx
+
+        graph = nx.Graph()
+        graph.add_nodes_from(self.nodes.items())
+        graph.add_edges_from(self.edges(data=True))
+        return graph
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.nodes
@@ -1,6 +1,57 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-from .device import Device
+import sys
+from collections import defaultdict, namedtuple
+import numpy as np
+from .device import Device, ROUTER, HOST
+from .graph import AdjGraph
+
+# Shared box style for node labels
+NODE_LABEL_BBOX = dict(
+    facecolor='white',
+    edgecolor='#DDDDDD',
+    alpha=0.8,
+    boxstyle='round,pad=0.3',
+    linewidth=0.5
+)
+
+# Device type styling
+Style = namedtuple('Style', 'color shape size edgecolor linewidth')
+DEVICE_STYLES = {
+    'router': Style('#FF6B6B', 's', 1500, '#CC0000', 2),     # Coral red square
+    'switch': Style('#4ECDC4', 'h', 1200, '#1A7F7A', 1.5),   # Turquoise hexagon
+    'host': Style('#A5D8A2', '^', 1000, '#3D8B37', 1.5),     # Light green triangle
+    'default': Style('#D3D3D3', 'o', 800, '#A9A9A9', 1)      # Light gray circle
+}
+
+# vis.js node shapes matching the matplotlib markers above
+PYVIS_SHAPES = {
+    's': 'square',
+    'h': 'hexagon',
+    '^': 'triangle',
+    'o': 'dot'
+}
+
+def _ip_to_str(packed):
+    """Format a packed 32-bit IPv4 address as a dotted-quad string."""
+    return f"{(packed >> 24) & 0xff}.{(packed >> 16) & 0xff}.{(packed >> 8) & 0xff}.{packed & 0xff}"
+
+# Network segments and their base IPs, packed as 32-bit integers
+NETWORK_SEGMENTS = {
+    'R1-SW1': (192 << 24) | (168 << 16) | (1 << 8),
+    'R2-SW2': (192 << 24) | (168 << 16) | (2 << 8),
+    'R1-R2': 10 << 24,
+    'SW1-PC1': (192 << 24) | (168 << 16) | (1 << 8),
+    'SW1-PC2': (192 << 24) | (168 << 16) | (1 << 8),
+    'SW2-WebServer': (192 << 24) | (168 << 16) | (2 << 8),
+    'SW2-DBServer': (192 << 24) | (168 << 16) | (2 << 8)
+}
+DEFAULT_SEGMENT = 10 << 24  # 10.0.0.0
+
+# Spring layout iterations run on top of the hierarchical layout
+SPRING_ITERATIONS = {
+    'hierarchical': 0,
+    'hybrid': 5,
+    'spring': 50
+}
 
 class NetworkTopology:
     """Class representing a network topology."""
@@ -8,8 +59,17 @@ class NetworkTopology:
     def __init__(self, name):
         """Initialize an empty network topology."""
         self.name = name
-        self.graph = nx.Graph()
+        self.graph = AdjGraph()
         self.devices = {}
+        self.node_id = {}       # device name -> small integer id, never reused
+        self.node_names = []    # node id -> device name
+        self._adj_version = 0
+        self._csr_cache = None
+        self._path_cache = {}  # (source, target) -> path, cleared on mutation
+        self._layout_cache = None
+        self._fig = None
+        self._ips_assigned = False
+        self._ax = None
     
     def add_device(self, device):
         """Add a device to the network."""
@@ -19,14 +79,56 @@ class NetworkTopology:
         if device.name in self.devices:
             raise ValueError(f"Device with name '{device.name}' already exists")
         
+        device.name = sys.intern(device.name)
         self.devices[device.name] = device
+        self._assign_node_id(device.name)
         self.graph.add_node(device.name, device=device, type=device.device_type)
+        self._adj_version += 1
+        self._path_cache.clear()
+    
+    def add_devices(self, devices):
+        """
+        Add several devices to the network at once.
+        
+        All devices are validated before any is added, so a duplicate name
+        leaves the network unchanged.
+        """
+        devices = list(devices)
+        for device in devices:
+            if not isinstance(device, Device):
+                raise ValueError("Device must be an instance of Device class")
+        
+        names = [sys.intern(device.name) for device in devices]
+        new = set(names)
+        if len(new) != len(names):
+            raise ValueError("Duplicate device names in batch")
+        duplicates = new & self.devices.keys()
+        if duplicates:
+            raise ValueError(f"Devices with names {sorted(duplicates)} already exist")
+        
+        for device, name in zip(devices, names):
+            device.name = name
+            self._assign_node_id(name)
+        self.devices.update(zip(names, devices))
+        self.graph.add_nodes_from(
+            (device.name, {'device': device, 'type': device.device_type}) for device in devices
+        )
+        self._adj_version += 1
+        self._path_cache.clear()
+    
+    def _assign_node_id(self, name):
+        """Give a device name a compact integer id, keeping the id of a re-added name."""
+        if name not in self.node_id:
+            self.node_id[name] = len(self.node_names)
+            self.node_names.append(name)
     
     def remove_device(self, device_name):
         """Remove a device from the network."""
         if device_name in self.devices:
             self.graph.remove_node(device_name)
             del self.devices[device_name]
+            self._adj_version += 1
+            self._path_cache.clear()
     
     def connect_devices(self, device1_name, interface1, device2_name, interface2, **link_attrs):
         """
@@ -42,6 +144,36 @@ class NetworkTopology:
         if device1_name not in self.devices or device2_name not in self.devices:
             raise ValueError("Both devices must exist in the network")
         
+        self._add_link(device1_name, interface1, device2_name, interface2, link_attrs)
+        self._adj_version += 1
+        self._path_cache.clear()
+        self._ips_assigned = False
+    
+    def connect_devices_bulk(self, links):
+        """
+        Connect several pairs of devices at once.
+        
+        Args:
+            links: Iterable of (device1_name, interface1, device2_name, interface2)
+                tuples, optionally with a fifth item holding a dict of link attributes
+        """
+        links = list(links)
+        for link in links:
+            if link[0] not in self.devices or link[2] not in self.devices:
+                raise ValueError("Both devices must exist in the network")
+        
+        for link in links:
+            link_attrs = link[4] if len(link) > 4 else {}
+            self._add_link(link[0], link[1], link[2], link[3], link_attrs)
+        self._adj_version += 1
+        self._path_cache.clear()
+        self._ips_assigned = False
+    
+    def _add_link(self, device1_name, interface1, device2_name, interface2, link_attrs):
+        """Record a link on both device interfaces and in the graph."""
+        interface1 = sys.intern(interface1)
+        interface2 = sys.intern(interface2)
+        
         # Update device interfaces
         self.devices[device1_name].add_interface(interface1, connected_to=device2_name)
         self.devices[device2_name].add_interface(interface2, connected_to=device1_name)
@@ -55,80 +187,180 @@ class NetworkTopology:
             **link_attrs
         )
     
+    def _get_csr(self):
+        """
+        Return a CSR snapshot of the adjacency, rebuilt only after mutations.
+
+        Returns:
+            Tuple of (node_ids, names, indptr, indices) where node_ids maps
+            device names to integer ids, names is the inverse list, and the
+            neighbors of node u are indices[indptr[u]:indptr[u + 1]].
+        """
+        cache = self._csr_cache
+        if cache is not None and cache[0] == self._adj_version:
+            return cache[1]
+
+        adj = self.graph.adj
+        names = list(adj)
+        node_ids = {name: i for i, name in enumerate(names)}
+
+        indptr = np.zeros(len(names) + 1, dtype=np.int32)
+        flat = []
+        for i, name in enumerate(names):
+            flat.extend(node_ids[nbr] for nbr in adj[name])
+            indptr[i + 1] = len(flat)
+        indices = np.array(flat, dtype=np.int32)
+
+        csr = (node_ids, names, indptr, indices)
+        self._csr_cache = (self._adj_version, csr)
+        return csr
+
     def get_shortest_path(self, source, target):
-        """Get the shortest path between two devices."""
-        try:
-            return nx.shortest_path(self.graph, source=source, target=target)
-        except nx.NetworkXNoPath:
-            return None
+        """
+        Get the shortest path between two devices.
+
+        Results are cached until the topology changes. Returns None if the
+        devices are not connected.
+        """
+        key = (source, target)
+        if key in self._path_cache:
+            path = self._path_cache[key]
+        else:
+            path = self._bidirectional_bfs(source, target)
+            self._path_cache[key] = path
+            # Links are undirected, so the reverse query has the reversed path
+            self._path_cache[(target, source)] = path[::-1] if path else path
+        return list(path) if path else path
+
+    def _bidirectional_bfs(self, source, target):
+        """
+        Run a bidirectional BFS over the cached CSR adjacency, always
+        expanding the smaller frontier, and stop as soon as both searches meet.
+        """
+        node_ids, names, indptr, indices = self._get_csr()
+        if source not in node_ids or target not in node_ids:
+            from networkx import NodeNotFound
+            if source not in node_ids:
+                raise NodeNotFound(f"Source {source} is not in G")
+            raise NodeNotFound(f"Target {target} is not in G")
+        if source == target:
+            return [source]
+
+        s, t = node_ids[source], node_ids[target]
+        pf = {s: -1}  # Forward parents
+        pb = {t: -1}  # Backward parents
+        fwd = {s}
+        bwd = {t}
+
+        while fwd and bwd:
+            # Expand the smaller frontier
+            if len(fwd) <= len(bwd):
+                frontier, parents, others = fwd, pf, pb
+            else:
+                frontier, parents, others = bwd, pb, pf
+
+            next_frontier = set()
+            for u in frontier:
+                for v in indices[indptr[u]:indptr[u + 1]].tolist():
+                    if v in parents:
+                        continue
+                    parents[v] = u
+                    if v in others:
+                        return [names[i] for i in self._stitch_path(pf, pb, v)]
+                    next_frontier.add(v)
+
+            if frontier is fwd:
+                fwd = next_frontier
+            else:
+                bwd = next_frontier
+
+        return None
+
+    @staticmethod
+    def _stitch_path(pf, pb, meet):
+        """Join the forward and backward BFS trees at the meeting node."""
+        path = []
+        node = meet
+        while node != -1:
+            path.append(node)
+            node = pf[node]
+        path.reverse()
+
+        node = pb[meet]
+        while node != -1:
+            path.append(node)
+            node = pb[node]
+        return path
     
     def _generate_ip_address(self, base_network, host_num):
-        base_parts = list(map(int, base_network.split('.')))
-        base_parts[3] += host_num
-        return '.'.join(map(str, base_parts))
-
-    def draw_topology(self, filename=None):
+        """Return the dotted-quad address of host_num within a packed base network."""
+        return _ip_to_str(base_network + host_num)
+    
+    def _set_interface_ip(self, device_name, interface_name, ip_address):
+        """Configure an address on an interface, keeping its existing link info."""
+        device = self.devices[device_name]
+        config = device.interfaces.get(interface_name)
+        if config is None:
+            device.add_interface(interface_name, ip_address=ip_address,
+                                 subnet_mask='24', status='up')
+        else:
+            config.ip_address = ip_address
+            config.subnet_mask = '24'
+            config.status = 'up'
+    
+    def assign_ip_addresses(self):
         """
-        Draw an enhanced network topology visualization with improved styling.
+        Assign IP addresses to the interfaces on every link.
         
-        Args:
-            filename (str, optional): If provided, saves the plot to the specified file.
+        Router links get .1 on the router side and .2 on the other side, and
+        hosts are numbered from .10 upwards on each switch.
         """
-        plt.figure(figsize=(14, 10))
-        plt.style.use('default')  # Use default style for better compatibility
-        plt.rcParams['figure.facecolor'] = 'white'  # Set white background
-        
-        # Define network segments and their base IPs
-        network_segments = {
-            'R1-SW1': '192.168.1.0',
-            'R2-SW2': '192.168.2.0',
-            'R1-R2': '10.0.0.0',
-            'SW1-PC1': '192.168.1.0',
-            'SW1-PC2': '192.168.1.0',
-            'SW2-WebServer': '192.168.2.0',
-            'SW2-DBServer': '192.168.2.0'
-        }
-        
-        # Define device type styling
-        device_styles = {
-            'router': {
-                'color': '#FF6B6B',  # Coral red
-                'shape': 's',        # Square
-                'size': 1500,
-                'edgecolor': '#CC0000',
-                'linewidth': 2
-            },
-            'switch': {
-                'color': '#4ECDC4',  # Turquoise
-                'shape': 'h',        # Hexagon
-                'size': 1200,
-                'edgecolor': '#1A7F7A',
-                'linewidth': 1.5
-            },
-            'host': {
-                'color': '#A5D8A2',  # Light green
-                'shape': '^',        # Triangle up
-                'size': 1000,
-                'edgecolor': '#3D8B37',
-                'linewidth': 1.5
-            },
-            'default': {
-                'color': '#D3D3D3',  # Light gray
-                'shape': 'o',        # Circle
-                'size': 800,
-                'edgecolor': '#A9A9A9',
-                'linewidth': 1
-            }
-        }
+        nodes = self.graph.nodes
+        next_host_index = defaultdict(int)  # Hosts numbered so far on each switch
+        for u, v, iface_u, iface_v, *_ in self.graph.links():
+            base_network = NETWORK_SEGMENTS.get(f"{u}-{v}")
+            if base_network is None:
+                base_network = NETWORK_SEGMENTS.get(f"{v}-{u}", DEFAULT_SEGMENT)
+            type_u, type_v = nodes[u]['type'], nodes[v]['type']
+            
+            if type_u is ROUTER or type_v is ROUTER:
+                # Router connections
+                if type_u is ROUTER:
+                    ip_u = self._generate_ip_address(base_network, 1)
+                    ip_v = self._generate_ip_address(base_network, 2)
+                else:
+                    ip_u = self._generate_ip_address(base_network, 2)
+                    ip_v = self._generate_ip_address(base_network, 1)
+                self._set_interface_ip(u, iface_u, ip_u)
+                self._set_interface_ip(v, iface_v, ip_v)
+            else:
+                # Host connections
+                host, iface = (u, iface_u) if type_u is HOST else (v, iface_v)
+                switch = v if host == u else u
+                host_num = 10 + next_host_index[switch]
+                next_host_index[switch] += 1
+                self._set_interface_ip(host, iface, self._generate_ip_address(base_network, host_num))
+        
+        self._ips_assigned = True
+
+    def _node_data(self):
+        """
+        Collect the type, style and label of every device for drawing.
         
-        # Prepare node data
+        Returns:
+            Tuple of (node_data, nodes_by_style) where nodes_by_style maps each
+            DEVICE_STYLES key to the devices drawn with it.
+        """
         node_data = {}
+        nodes_by_style = {}
         for node in self.graph.nodes():
-            device_type = self.graph.nodes[node].get('type', 'unknown').lower()
+            device_type = self.graph.nodes[node].get('type', 'unknown')
             device = self.graph.nodes[node].get('device')
             
             # Get style for this device type
-            style = device_styles.get(device_type, device_styles['default'])
+            style_key = device_type if device_type in DEVICE_STYLES else 'default'
+            style = DEVICE_STYLES[style_key]
+            nodes_by_style.setdefault(style_key, []).append(node)
             
             # Build node label
             label_parts = [f"{node} ({device_type.upper()})"]
@@ -136,9 +368,9 @@ class NetworkTopology:
             # Add IP addresses if available
             if device and hasattr(device, 'interfaces'):
                 for iface, config in device.interfaces.items():
-                    if 'ip_address' in config and config['ip_address']:
-                        subnet = config.get('subnet_mask', '24')
-                        label_parts.append(f"{iface}: {config['ip_address']}/{subnet}")
+                    if config.ip_address:
+                        subnet = config.subnet_mask or '24'
+                        label_parts.append(f"{iface}: {config.ip_address}/{subnet}")
             
             node_data[node] = {
                 'style': style,
@@ -146,129 +378,178 @@ class NetworkTopology:
                 'type': device_type
             }
         
-        # Create a hierarchical layout
-        pos = {}  # Position dictionary
-        level_height = 0
-        levels = {
-            'router': 0,
-            'switch': 1,
-            'host': 2,
-            'default': 3
-        }
-        
-        # Group nodes by type
-        nodes_by_type = {}
+        return node_data, nodes_by_style
+    
+    def _link_labels(self, node_data):
+        """
+        Sort links by style and build their address labels.
+        
+        Returns:
+            Tuple of (router_edges, other_edges, edge_labels).
+        """
+        edge_labels = {}
+        router_edges = []
+        other_edges = []
+        devices = self.devices
+        for u, v, iface_u, iface_v, *_ in self.graph.links():
+            config_u = devices[u].interfaces.get(iface_u)
+            config_v = devices[v].interfaces.get(iface_v)
+            
+            if node_data[u]['type'] is ROUTER or node_data[v]['type'] is ROUTER:
+                router_edges.append((u, v))
+                if config_u and config_u.ip_address and config_v and config_v.ip_address:
+                    edge_labels[(u, v)] = (f"{iface_u}: {config_u.ip_address}/{config_u.subnet_mask}\n"
+                                           f"{iface_v}: {config_v.ip_address}/{config_v.subnet_mask}")
+            else:
+                other_edges.append((u, v))
+                iface, config = (iface_u, config_u) if node_data[u]['type'] is HOST else (iface_v, config_v)
+                if config and config.ip_address:
+                    edge_labels[(u, v)] = f"{iface}: {config.ip_address}/{config.subnet_mask}"
+        
+        return router_edges, other_edges, edge_labels
+    
+    def _draw_topology_pyvis(self, filename):
+        """Write the topology as an interactive HTML page laid out in the browser."""
+        from pyvis.network import Network
+        
+        node_data, _ = self._node_data()
+        _, _, edge_labels = self._link_labels(node_data)
+        
+        # Inline the JS/CSS so only the requested HTML file is written
+        net = Network(height='800px', width='100%', cdn_resources='in_line')
         for node, data in node_data.items():
-            node_type = data['type']
-            if node_type not in nodes_by_type:
-                nodes_by_type[node_type] = []
-            nodes_by_type[node_type].append(node)
+            style = data['style']
+            net.add_node(node, label=node, color=style.color,
+                         shape=PYVIS_SHAPES[style.shape], title=data['label'])
+        for u, v in self.graph.edges():
+            net.add_edge(u, v, label=edge_labels.get((u, v), ''))
+        
+        # Large graphs render immediately without the physics simulation
+        if len(node_data) > 100:
+            net.toggle_physics(False)
+        
+        net.write_html(filename)
+        print(f"Network topology saved to {filename}")
+    
+    def draw_topology(self, filename=None, layout='hierarchical', ax=None, backend='matplotlib'):
+        """
+        Draw an enhanced network topology visualization with improved styling.
+        
+        Args:
+            filename (str, optional): If provided, saves the plot to the specified file.
+            layout (str, optional): 'hierarchical' places devices in fixed tiers,
+                'spring' relaxes the tiers with a full spring layout and 'hybrid'
+                runs only a few spring iterations.
+            ax (matplotlib.axes.Axes, optional): Axes to draw into. By default the
+                topology reuses its own figure across calls.
+            backend (str, optional): 'matplotlib' draws a static image, 'pyvis'
+                writes an interactive HTML page to filename (requires pyvis).
+        """
+        if backend not in ('matplotlib', 'pyvis'):
+            raise ValueError(f"Unknown backend '{backend}'")
+        if layout not in SPRING_ITERATIONS:
+            raise ValueError(f"Unknown layout '{layout}'")
+        
+        if not self._ips_assigned:
+            self.assign_ip_addresses()
+        
+        if backend == 'pyvis':
+            if not filename:
+                raise ValueError("The pyvis backend requires a filename")
+            self._draw_topology_pyvis(filename)
+            return
+        
+        # Plotting libraries are slow to import, so load them only when drawing
+        import matplotlib.pyplot as plt
+        import networkx as nx
+        
+        graph = self.graph.to_networkx()
+        
+        if ax is not None:
+            fig = ax.figure
+        elif self._fig is not None and plt.fignum_exists(self._fig.number):
+            fig, ax = self._fig, self._ax
+            ax.clear()
+        else:
+            plt.style.use('default')  # Use default style for better compatibility
+            plt.rcParams['figure.facecolor'] = 'white'  # Set white background
+            fig, ax = plt.subplots(figsize=(14, 10))
+            self._fig, self._ax = fig, ax
+        
+        node_data, nodes_by_style = self._node_data()
+        
+        # Create a hierarchical layout, one row of positions per device
+        names = list(node_data)
+        name_to_idx = {node: i for i, node in enumerate(names)}
+        pos_arr = np.empty((len(names), 2))
         
         # Position nodes in hierarchical levels
-        for node_type in ['router', 'switch', 'host', 'default']:
-            if node_type in nodes_by_type:
-                level_nodes = nodes_by_type[node_type]
-                level_width = 1.0 / (len(level_nodes) + 1)
-                
-                for i, node in enumerate(level_nodes):
-                    x = (i + 1) * level_width
-                    y = 1.0 - (levels.get(node_type, 3) * 0.3)
-                    pos[node] = (x, y)
+        for level, style_key in enumerate(['router', 'switch', 'host', 'default']):
+            level_nodes = nodes_by_style.get(style_key)
+            if not level_nodes:
+                continue
+            idx = [name_to_idx[node] for node in level_nodes]
+            level_width = 1.0 / (len(level_nodes) + 1)
+            pos_arr[idx, 0] = np.arange(1, len(level_nodes) + 1) * level_width
+            pos_arr[idx, 1] = 1.0 - level * 0.3
         
         # Adjust layout for better spacing
-        pos = nx.spring_layout(self.graph, pos=pos, k=0.8, iterations=50)
-        
-        # Draw edges with bandwidth labels
-        edge_labels = {}
-        for u, v, data in self.graph.edges(data=True):
-            # Generate IPs for this connection
-            segment_key = f"{u}-{v}" if f"{u}-{v}" in network_segments else f"{v}-{u}"
-            base_network = network_segments.get(segment_key, '10.0.0.0')
-            
-            # Get interface names
-            iface1 = data.get('interface1', 'eth0')
-            iface2 = data.get('interface2', 'eth0')
-            
-            # Assign IPs based on device types
-            if node_data[u]['type'] == 'router' or node_data[v]['type'] == 'router':
-                # Router connections
-                if node_data[u]['type'] == 'router':
-                    router, switch = u, v
-                    ip1 = f"{base_network}.1"
-                    ip2 = f"{base_network}.2"
-                else:
-                    router, switch = v, u
-                    ip1 = f"{base_network}.2"
-                    ip2 = f"{base_network}.1"
-                
-                # Update device interfaces
-                if self.graph.nodes[u].get('device'):
-                    self.graph.nodes[u]['device'].add_interface(iface1, 
-                                                              ip_address=ip1,
-                                                              subnet_mask='24',
-                                                              status='up')
-                
-                if self.graph.nodes[v].get('device'):
-                    self.graph.nodes[v]['device'].add_interface(iface2,
-                                                              ip_address=ip2,
-                                                              subnet_mask='24',
-                                                              status='up')
-                
-                edge_labels[(u, v)] = f"{iface1}: {ip1}/24\n{iface2}: {ip2}/24"
+        iterations = SPRING_ITERATIONS[layout]
+        if iterations:
+            cache = self._layout_cache
+            if cache is not None and cache[:2] == (self._adj_version, layout):
+                pos_arr = cache[2]
             else:
-                # Host connections
-                host = u if node_data[u]['type'] == 'host' else v
-                switch = v if host == u else u
-                host_num = 10 + len([n for n in self.graph.neighbors(switch) 
-                                   if node_data.get(n, {}).get('type') == 'host' and n != host])
-                
-                if self.graph.nodes[host].get('device'):
-                    ip = f"{base_network.split('.')[0]}.{base_network.split('.')[1]}.{base_network.split('.')[2]}.{host_num}"
-                    self.graph.nodes[host]['device'].add_interface('eth0',
-                                                                 ip_address=ip,
-                                                                 subnet_mask='24',
-                                                                 status='up')
-                    edge_labels[(u, v)] = f"eth0: {ip}/24"
-        
-        # Draw edges with different styles
-        for u, v, data in self.graph.edges(data=True):
-            edge_color = '#888888'
-            edge_style = 'solid'
-            edge_width = 1.5
-            
-            # Style router connections differently
-            if node_data[u]['type'] == 'router' or node_data[v]['type'] == 'router':
-                edge_color = '#FF6B6B'  # Match router color
-                edge_width = 2.5
-            
-            nx.draw_networkx_edges(
-                self.graph, 
+                initial = {node: pos_arr[i] for node, i in name_to_idx.items()}
+                relaxed = nx.spring_layout(graph, pos=initial, k=0.8, iterations=iterations)
+                pos_arr = np.array([relaxed[node] for node in names])
+                self._layout_cache = (self._adj_version, layout, pos_arr)
+        
+        # Dict views onto the position rows for networkx
+        pos = {node: pos_arr[i] for node, i in name_to_idx.items()}
+        
+        router_edges, other_edges, edge_labels = self._link_labels(node_data)
+        
+        # Draw edges in one batch per style
+        edge_styles = (
+            (router_edges, '#FF6B6B', 2.5),  # Match router color
+            (other_edges, '#888888', 1.5),
+        )
+        for edgelist, edge_color, edge_width in edge_styles:
+            if not edgelist:
+                continue
+            edge_collection = nx.draw_networkx_edges(
+                graph, 
                 pos, 
-                edgelist=[(u, v)],
+                edgelist=edgelist,
                 width=edge_width,
                 alpha=0.8,
                 edge_color=edge_color,
-                style=edge_style,
-                arrows=False
+                style='solid',
+                arrows=False,
+                ax=ax
             )
+            edge_collection.set_rasterized(True)  # Edges don't need vector precision
         
-        # Draw nodes with individual styling
-        for node, data in node_data.items():
+        # Draw nodes in one batch per device style
+        for style_key, nodelist in nodes_by_style.items():
+            color, shape, size, edgecolor, linewidth = DEVICE_STYLES[style_key]
             nx.draw_networkx_nodes(
-                self.graph,
+                graph,
                 pos,
-                nodelist=[node],
-                node_size=data['style']['size'],
-                node_color=data['style']['color'],
-                node_shape=data['style']['shape'],
-                edgecolors=data['style']['edgecolor'],
-                linewidths=data['style']['linewidth'],
-                alpha=0.9
+                nodelist=nodelist,
+                node_size=size,
+                node_color=color,
+                node_shape=shape,
+                edgecolors=edgecolor,
+                linewidths=linewidth,
+                alpha=0.9,
+                ax=ax
             )
         
         # Draw edge labels with better formatting
         nx.draw_networkx_edge_labels(
-            self.graph,
+            graph,
             pos,
             edge_labels=edge_labels,
             font_size=8,
@@ -279,36 +560,35 @@ class NetworkTopology:
                 alpha=0.85,
                 boxstyle='round,pad=0.2',
                 linewidth=0.5
-            )
+            ),
+            ax=ax
         )
         
         # Draw node labels with improved formatting
-        for node, (x, y) in pos.items():
-            plt.text(
-                x, y + 0.02,  # Slight vertical offset
-                node_data[node]['label'],
-                horizontalalignment='center',
-                verticalalignment='bottom',
-                fontsize=9,
-                fontweight='bold',
-                bbox=dict(
-                    facecolor='white',
-                    edgecolor='#DDDDDD',
-                    alpha=0.8,
-                    boxstyle='round,pad=0.3',
-                    linewidth=0.5
-                )
-            )
+        labels = {node: node_data[node]['label'] for node in pos}
+        label_pos_arr = pos_arr + (0, 0.02)  # Slight vertical offset
+        label_pos = {node: label_pos_arr[i] for node, i in name_to_idx.items()}
+        nx.draw_networkx_labels(
+            graph,
+            label_pos,
+            labels=labels,
+            font_size=9,
+            font_weight='bold',
+            horizontalalignment='center',
+            verticalalignment='bottom',
+            bbox=NODE_LABEL_BBOX,
+            ax=ax
+        )
         
         # Add title and subtitle
-        plt.suptitle(
+        fig.suptitle(
             f"Network Topology: {self.name}",
             fontsize=16,
             fontweight='bold',
             y=0.98
         )
         
-        plt.title(
+        ax.set_title(
             "IP Addressing Scheme: Class C Private Networks | Line: Solid=Router, Dashed=Switch",
             fontsize=10,
             color='#666666'
@@ -339,7 +619,7 @@ class NetworkTopology:
                       markeredgewidth=1.5)
         ]
         
-        legend = plt.legend(
+        legend = ax.legend(
             handles=legend_elements,
             loc='upper right',
             frameon=True,
@@ -351,15 +631,17 @@ class NetworkTopology:
         legend.get_frame().set_linewidth(0.5)
         
         # Remove axis
-        plt.axis('off')
-        plt.tight_layout(rect=[0, 0, 1, 0.97])  # Adjust for suptitle
+        ax.axis('off')
+        ax.margins(y=0.15)  # Headroom for the multi-line node labels
+        if fig is self._fig:
+            # Fixed margins leave room for the suptitle without a tight-bbox render pass
+            fig.subplots_adjust(left=0.02, right=0.98, top=0.94, bottom=0.02)
         
         # Save or show the plot
         if filename:
-            plt.savefig(
+            fig.savefig(
                 filename,
-                dpi=300,
-                bbox_inches='tight',
+                dpi=150,
                 facecolor='white'
             )
             print(f"Network topology saved to {filename}")
@@ -370,6 +652,13 @@ class NetworkTopology:
         """Get a device by name."""
         return self.devices.get(device_name)
     
+    def get_interface(self, device_name, interface_name):
+        """Get an interface by device and interface name."""
+        device = self.devices.get(device_name)
+        if device is None:
+            return None
+        return device.interfaces.get(interface_name)
+    
     def __str__(self):
         """String representation of the network."""
         return f"Network '{self.name}' with {len(self.devices)} devices and {self.graph.number_of_edges()} links"
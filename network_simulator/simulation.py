@@ -1,12 +1,25 @@
-import time
-import random
+import sys
+import heapq
 import json
+import logging
+import numpy as np
+from array import array
+from types import MappingProxyType
 from enum import Enum, auto
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
-from queue import Queue, PriorityQueue
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+RAND_POOL_SIZE = 65536  # Uniform draws fetched from the RNG per refill
+
+
 class PacketType(Enum):
     ICMP_ECHO = auto()
     ICMP_REPLY = auto()
@@ -14,7 +27,7 @@ class PacketType(Enum):
     UDP = auto()
     ROUTING_UPDATE = auto()
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Packet:
     source: str
     destination: str
@@ -22,38 +35,94 @@ class Packet:
     payload: any = None
     ttl: int = 64
     size: int = 1500
-    timestamp: float = field(default_factory=time.time)
-    path: List[str] = field(default_factory=list)
+    timestamp: float = 0.0  # Virtual time the packet was last sent or queued
     sequence: int = 0
+    path_ids: array = field(default_factory=lambda: array('H'), repr=False)
+    visited_mask: int = 0  # Bit i is set once node id i is on the path
+    node_names: Optional[List[str]] = field(default=None, repr=False)
+    creation_time: float = field(default=0.0, repr=False)  # Virtual time the packet was sent
+    _type_name: str = field(init=False, repr=False)
     
     def __post_init__(self):
-        self.path = [self.source]
-        self.creation_time = time.time()
+        self.source = sys.intern(self.source)
+        self.destination = sys.intern(self.destination)
+        self._type_name = self.packet_type.name
+    
+    def start(self, source_id: int, node_names: List[str]):
+        """Place the packet at its source, given the topology's id -> name list."""
+        self.path_ids = array('H', (source_id,))
+        self.visited_mask = 1 << source_id
+        self.node_names = node_names
     
-    def add_hop(self, node: str) -> bool:
-        if node in self.path:
+    @property
+    def path(self) -> List[str]:
+        """Names of the devices visited so far, starting at the source."""
+        if self.node_names is None:
+            return [self.source]
+        names = self.node_names
+        return [names[i] for i in self.path_ids]
+    
+    def add_hop(self, node_id: int) -> bool:
+        """Move to node_id; return False on a routing loop or when the TTL runs out."""
+        bit = 1 << node_id
+        mask = self.visited_mask
+        if mask & bit:
             return False
-        self.path.append(node)
-        self.ttl -= 1
-        return self.ttl > 0
+        self.visited_mask = mask | bit
+        self.path_ids.append(node_id)
+        ttl = self.ttl = self.ttl - 1
+        return ttl > 0
     
     def to_dict(self) -> dict:
         return {
             'source': self.source,
             'destination': self.destination,
-            'type': self.packet_type.name,
+            'type': self._type_name,
             'ttl': self.ttl,
             'size': self.size,
             'path': self.path,
             'sequence': self.sequence,
-            'latency': time.time() - self.creation_time
+            'latency': self.timestamp - self.creation_time
         }
     
+    def to_json(self) -> bytes:
+        """Serialize to_dict() as UTF-8 JSON, using orjson when it is installed."""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), separators=(',', ':')).encode()
+    
     def __str__(self) -> str:
-        return (f"Packet({self.packet_type.name}) from {self.source} to {self.destination} "
+        return (f"Packet({self._type_name}) from {self.source} to {self.destination} "
                 f"TTL:{self.ttl} Size:{self.size}bytes")
 
 
+@dataclass(slots=True)
+class TrafficStats:
+    """Running packet counters; latency is kept as a sum and count rather than a list."""
+    sent: int = 0
+    received: int = 0
+    dropped: int = 0
+    latency_sum: float = 0.0
+    latency_count: int = 0
+    
+    @property
+    def avg_latency(self) -> float:
+        """Mean delivery latency in seconds, or 0.0 before any delivery."""
+        return self.latency_sum / self.latency_count if self.latency_count else 0.0
+
+
+def _simulate_pings(count, lo, hi, loss_rate, rng):
+    """
+    Draw the outcome of count pings in one vectorized pass.
+    
+    Returns:
+        Tuple of (latencies in ms, boolean mask of pings that got a reply)
+    """
+    latencies = lo + (hi - lo) * rng.random(count)
+    replied = rng.random(count) >= loss_rate
+    return latencies, replied
+
+
 class NetworkSimulation:
     """
     Advanced network simulation with routing protocols and traffic analysis.
@@ -68,22 +137,50 @@ class NetworkSimulation:
     
     def __init__(self, network):
         self.network = network
-        self.event_queue = PriorityQueue()
-        self.time = 0
+        self.event_queue = []  # Heap of (time, seq, packet) events
+        self.virtual_time = 0.0  # Simulated clock in seconds
+        self._event_counter = 0  # Breaks ties between events scheduled at the same time
         self.packet_loss_rate = 0.01  # 1% packet loss
         self.latency_range = (1, 10)   # ms
+        self._rng = np.random.default_rng()
+        self._rand_pool = []  # Pre-drawn uniforms in [0, 1), consumed by _rand()
+        self._rand_idx = 0
         self.bandwidth = 1000  # Mbps
         self.running = False
         self.packet_counter = 0
         self.routing_tables = {}
-        self.traffic_stats = {
-            'sent': 0,
-            'received': 0,
-            'dropped': 0,
-            'latency': []
-        }
+        self._nexthop = {}  # (source, destination) -> next hop
+        self._nexthop_arr = None  # [source id, destination id] -> next hop id, -1 if unreachable
+        self._nexthop_arr_version = None  # Topology version _nexthop_arr was built for
+        self._nexthop_version = None  # Topology version the table was built for
+        self.stats = TrafficStats()
         self._init_routing_tables()
     
+    @property
+    def traffic_stats(self) -> MappingProxyType:
+        """
+        Read-only snapshot of the traffic counters.
+        
+        Update counters through self.stats; the per-packet 'latency' list is
+        no longer kept, use 'avg_latency' or stats.latency_sum instead.
+        """
+        stats = self.stats
+        return MappingProxyType({
+            'sent': stats.sent,
+            'received': stats.received,
+            'dropped': stats.dropped,
+            'avg_latency': stats.avg_latency
+        })
+    
+    def _rand(self) -> float:
+        """Return the next uniform draw from the pre-drawn pool, refilling it when exhausted."""
+        if self._rand_idx >= len(self._rand_pool):
+            self._rand_pool = self._rng.random(RAND_POOL_SIZE).tolist()
+            self._rand_idx = 0
+        value = self._rand_pool[self._rand_idx]
+        self._rand_idx += 1
+        return value
+    
     def _init_routing_tables(self):
         """Initialize routing tables for all routers."""
         for device_name, device in self.network.devices.items():
@@ -100,111 +197,160 @@ class NetworkSimulation:
             self.routing_tables[router_name][route_type][network] = {
                 'next_hop': next_hop,
                 'metric': metric,
-                'last_updated': time.time()
+                'last_updated': self.virtual_time
             }
     
     def get_route(self, source, destination):
-        """Get the best route from source to destination."""
-        try:
-            path = self.network.get_shortest_path(source, destination)
-            if path and len(path) > 1:
-                return path[1]  # Next hop
-            return None
-        except Exception as e:
-            print(f"Routing error: {e}")
-            return None
+        """Get the next hop on the best route from source to destination."""
+        if self._nexthop_version != self.network._adj_version:
+            self._build_nexthop_table()
+        return self._nexthop.get((source, destination))
+    
+    def _build_nexthop_table(self):
+        """
+        Precompute the next hop for every reachable (source, destination) pair.
+        
+        Runs one BFS per destination over the topology's CSR adjacency; each
+        node's BFS parent is its next hop towards that destination.
+        """
+        node_ids, names, indptr, indices = self.network._get_csr()
+        indptr = indptr.tolist()
+        indices = indices.tolist()
+        nexthop = {}
+        
+        for target in range(len(names)):
+            parent = {target: target}
+            frontier = [target]
+            while frontier:
+                next_frontier = []
+                for u in frontier:
+                    for v in indices[indptr[u]:indptr[u + 1]]:
+                        if v not in parent:
+                            parent[v] = u
+                            next_frontier.append(v)
+                frontier = next_frontier
+            
+            target_name = names[target]
+            for node, hop in parent.items():
+                if node != target:
+                    nexthop[(names[node], target_name)] = names[hop]
+        
+        self._nexthop = nexthop
+        self._nexthop_version = self.network._adj_version
+    
+    def _build_nexthop_array(self):
+        """Build the dense id-indexed next-hop matrix used by send_batch."""
+        if self._nexthop_version != self.network._adj_version:
+            self._build_nexthop_table()
+        
+        node_id = self.network.node_id
+        size = len(self.network.node_names)
+        dtype = np.int16 if size <= np.iinfo(np.int16).max else np.int32
+        nexthop_arr = np.full((size, size), -1, dtype=dtype)
+        if self._nexthop:
+            rows, cols, hops = zip(*[(node_id[src], node_id[dst], node_id[hop])
+                                     for (src, dst), hop in self._nexthop.items()])
+            nexthop_arr[rows, cols] = hops
+        
+        self._nexthop_arr = nexthop_arr
+        self._nexthop_arr_version = self._nexthop_version
     
     def send_packet(self, packet: Packet) -> bool:
         """Send a packet through the network."""
         if not self.running:
             return False
         
-        self.traffic_stats['sent'] += 1
+        devices = self.network.devices
+        if devices.get(packet.source) is None or devices.get(packet.destination) is None:
+            return False
+        
+        self.stats.sent += 1
         self.packet_counter += 1
         packet.sequence = self.packet_counter
         
-        if random.random() < self.packet_loss_rate:
-            self.traffic_stats['dropped'] += 1
+        if self._rand() < self.packet_loss_rate:
+            self.stats.dropped += 1
             return False
         
-        current = packet.path[-1]
+        packet.start(self.network.node_id[packet.source], self.network.node_names)
+        packet.creation_time = packet.timestamp = self.virtual_time
+        return self._dispatch(packet)
+    
+    def send_batch(self, packets: List[Packet]) -> int:
+        """
+        Send many packets at once, drawing their loss and first-hop latency in bulk.
         
-        if current == packet.destination:
-            self.traffic_stats['received'] += 1
-            self.traffic_stats['latency'].append(time.time() - packet.creation_time)
-            return True
+        Behaves like calling send_packet on each packet in turn, except that
+        all surviving packets are queued with a single heapify.
         
-        next_hop = self.get_route(current, packet.destination)
-        if not next_hop or not packet.add_hop(next_hop):
-            return False
+        Args:
+            packets: Packets to send
+            
+        Returns:
+            Number of packets delivered or queued for their next hop
+        """
+        if not self.running:
+            return 0
         
-        latency = random.uniform(*self.latency_range) / 1000  # Convert to seconds
-        self.event_queue.put((time.time() + latency, packet))
-        return True
-    
-    def ping(self, source: str, destination: str, count: int = 4) -> dict:
-        """Simulate ICMP ping between two hosts."""
-        results = {
-            'source': source,
-            'destination': destination,
-            'transmitted': 0,
-            'received': 0,
-            'lost': 0,
-            'times': [],
-            'min': 0,
-            'avg': 0,
-            'max': 0,
-            'mdev': 0
-        }
+        network = self.network
+        devices = network.devices
+        packets = [p for p in packets
+                   if devices.get(p.source) is not None and devices.get(p.destination) is not None]
+        n = len(packets)
+        if not n:
+            return 0
         
-        for i in range(count):
-            packet = Packet(
-                source=source,
-                destination=destination,
-                packet_type=PacketType.ICMP_ECHO,
-                sequence=i+1
-            )
-            
-            start_time = time.time()
-            success = self.send_packet(packet)
-            rtt = (time.time() - start_time) * 1000  # Convert to ms
-            
-            results['transmitted'] += 1
-            if success:
-                results['received'] += 1
-                results['times'].append(rtt)
-                print(f"64 bytes from {destination}: icmp_seq={i+1} ttl=64 time={rtt:.2f}ms")
-            else:
-                results['lost'] += 1
-                print(f"Request timeout for icmp_seq {i+1}")
-            
-            time.sleep(1)  # Wait 1 second between pings
+        if self._nexthop_arr_version != network._adj_version:
+            self._build_nexthop_array()
         
-        # Calculate statistics
-        if results['times']:
-            results['min'] = min(results['times'])
-            results['max'] = max(results['times'])
-            results['avg'] = sum(results['times']) / len(results['times'])
-            if len(results['times']) > 1:
-                squared_diffs = [(x - results['avg'])**2 for x in results['times']]
-                results['mdev'] = (sum(squared_diffs) / (len(results['times']) - 1)) ** 0.5
-        
-        print(f"\n--- {source} ping statistics ---")
-        print(f"{results['transmitted']} packets transmitted, "
-              f"{results['received']} received, "
-              f"{results['lost']*100/results['transmitted']:.1f}% packet loss, "
-              f"time {results['transmitted']*1000:.0f}ms")
-        
-        if results['received'] > 0:
-            print(f"rtt min/avg/max/mdev = "
-                  f"{results['min']:.3f}/{results['avg']:.3f}/"
-                  f"{results['max']:.3f}/{results['mdev']:.3f} ms")
+        node_id = network.node_id
+        src = np.fromiter((node_id[p.source] for p in packets), dtype=np.intp, count=n)
+        dst = np.fromiter((node_id[p.destination] for p in packets), dtype=np.intp, count=n)
+        lo, hi = self.latency_range
+        dropped = self._rng.random(n) < self.packet_loss_rate
+        arrival = self.virtual_time + self._rng.uniform(lo, hi, n) / 1000  # Convert to seconds
+        next_hops = self._nexthop_arr[src, dst]
         
-        return results
+        stats = self.stats
+        stats.sent += n
+        stats.dropped += int(dropped.sum())
+        
+        sequence = self.packet_counter
+        self.packet_counter += n
+        counter = self._event_counter
+        names = network.node_names
+        now = self.virtual_time
+        events = []
+        accepted = 0
+        
+        for packet, is_dropped, source_id, hop, hop_time, same in zip(
+                packets, dropped.tolist(), src.tolist(), next_hops.tolist(),
+                arrival.tolist(), (src == dst).tolist()):
+            sequence += 1
+            packet.sequence = sequence
+            if is_dropped:
+                continue
+            
+            packet.start(source_id, names)
+            packet.creation_time = packet.timestamp = now
+            if same:
+                stats.received += 1
+                stats.latency_count += 1
+                accepted += 1
+            elif hop >= 0 and packet.add_hop(hop):
+                counter += 1
+                events.append((hop_time, counter, packet))
+                accepted += 1
+        
+        self._event_counter = counter
+        if events:
+            self.event_queue.extend(events)
+            heapq.heapify(self.event_queue)
+        return accepted
     
-    def send_packet(self, source: str, destination: str, payload: any) -> Optional[Packet]:
+    def send_payload(self, source: str, destination: str, payload: any) -> bool:
         """
-        Send a packet from source to destination.
+        Wrap a payload in a TCP packet and send it from source to destination.
         
         Args:
             source: Source device name
@@ -212,29 +358,49 @@ class NetworkSimulation:
             payload: Packet payload
             
         Returns:
-            The sent packet if successful, None if dropped
+            True if the packet was delivered or queued for its next hop
         """
-        if source not in self.network.devices or destination not in self.network.devices:
-            print(f"Error: Source or destination device not found")
-            return None
+        return self.send_packet(Packet(source, destination, PacketType.TCP, payload))
+    
+    def _schedule(self, event_time, packet):
+        """Queue a packet to arrive at its next hop at the given virtual time."""
+        self._event_counter += 1
+        packet.timestamp = self.virtual_time
+        heapq.heappush(self.event_queue, (event_time, self._event_counter, packet))
+    
+    def _dispatch(self, packet: Packet) -> bool:
+        """Deliver a packet at its current hop or forward it to the next one."""
+        current = packet.node_names[packet.path_ids[-1]]
+        
+        if current == packet.destination:
+            now = self.virtual_time
+            packet.timestamp = now
+            stats = self.stats
+            stats.received += 1
+            stats.latency_sum += now - packet.creation_time
+            stats.latency_count += 1
+            return True
         
-        # Simulate packet loss
-        if random.random() < self.packet_loss_rate:
-            print(f"Packet from {source} to {destination} was lost!")
-            return None
+        next_hop = self.get_route(current, packet.destination)
+        if not next_hop or not packet.add_hop(self.network.node_id[next_hop]):
+            return False
         
-        # Create and return the packet
-        return Packet(source, destination, payload)
+        lo, hi = self.latency_range
+        latency = (lo + (hi - lo) * self._rand()) / 1000  # Convert to seconds
+        self._schedule(self.virtual_time + latency, packet)
+        return True
     
     def start(self):
         """Start the simulation."""
         self.running = True
-        print(f"Simulation started at time {self.time}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Simulation started at time %s", self.virtual_time)
     
     def stop(self):
         """Stop the simulation."""
         self.running = False
-        print(f"Simulation stopped at time {self.time}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Simulation stopped at time %s", self.virtual_time)
     
     def run(self, duration: float):
         """
@@ -246,23 +412,30 @@ class NetworkSimulation:
         if not self.running:
             self.start()
         
-        end_time = self.time + duration
+        end_time = self.virtual_time + duration
+        self._process_until(end_time)
+        if self.running:
+            self.virtual_time = end_time
+    
+    def _process_until(self, end_time: float):
+        """Dispatch queued events due before end_time in time order, never rewinding the clock."""
+        queue = self.event_queue
         
-        while self.running and self.time < end_time:
-            self.step()
-            time.sleep(0.1)  # Simulated time step
-            self.time += 0.1
+        # Jump the clock straight to each event instead of ticking through idle time
+        while self.running and queue and queue[0][0] < end_time:
+            event_time, _, packet = heapq.heappop(queue)
+            if event_time > self.virtual_time:
+                self.virtual_time = event_time
+            self._dispatch(packet)
     
     def step(self):
-        """Advance the simulation by one time step."""
-        # Process events in the queue
-        while not self.event_queue.empty():
-            event = self.event_queue.get()
-            # Process event here
-            # This is where you would implement event handling
-            pass
+        """Process every queued event that is due at the current virtual time."""
+        queue = self.event_queue
+        while queue and queue[0][0] <= self.virtual_time:
+            _, _, packet = heapq.heappop(queue)
+            self._dispatch(packet)
     
-    def ping(self, source: str, destination: str, count: int = 4) -> Dict:
+    def ping(self, source: str, destination: str, count: int = 4, verbose: bool = False) -> Dict:
         """
         Simulate a ping between two devices.
         
@@ -270,11 +443,16 @@ class NetworkSimulation:
             source: Source device name
             destination: Destination device name
             count: Number of ping packets to send
+            verbose: Collect the per-ping reply lines in results['log']
             
         Returns:
             Dictionary with ping statistics
         """
-        if source not in self.network.devices or destination not in self.network.devices:
+        if count < 0:
+            raise ValueError("Ping count must be non-negative")
+        
+        devices = self.network.devices
+        if devices.get(source) is None or devices.get(destination) is None:
             return {"error": "Source or destination device not found"}
         
         results = {
@@ -295,31 +473,44 @@ class NetworkSimulation:
         results["path"] = path
         
         # Simulate pings
-        for i in range(count):
-            results["sent"] += 1
-            
-            # Simulate network delay
-            latency = random.uniform(*self.latency_range) / 1000  # Convert to seconds
-            time.sleep(latency)
-            
-            # Check if packet is lost
-            if random.random() < self.packet_loss_rate:
-                results["lost"] += 1
-                print(f"Ping request to {destination} timed out")
-                continue
-            
-            # Packet made it
-            results["received"] += 1
-            results["times"].append(latency * 1000)  # Convert to ms
-            
-            # Print ping response
-            print(f"Reply from {destination}: bytes=32 time={latency*1000:.2f}ms TTL=64")
+        latencies, replied = _simulate_pings(count, *self.latency_range,
+                                             self.packet_loss_rate, self._rng)
+        # Let traffic already in flight catch up before the clock moves past it
+        end_time = self.virtual_time + latencies.sum() / 1000  # Convert to seconds
+        self._process_until(end_time)
+        self.virtual_time = end_time
+        
+        debug = log.isEnabledFor(logging.DEBUG)
+        if verbose or debug:
+            lines = [f"Reply from {destination}: bytes=32 time={latency:.2f}ms TTL=64" if ok
+                     else f"Ping request to {destination} timed out"
+                     for latency, ok in zip(latencies.tolist(), replied.tolist())]
+            if verbose:
+                results["log"] = lines
+            if debug:
+                for line in lines:
+                    log.debug("%s", line)
+        
+        results["sent"] = count
+        results["received"] = received = int(replied.sum())
+        results["lost"] = count - received
         
         # Calculate statistics
-        if results["received"] > 0:
-            results["min"] = min(results["times"])
-            results["max"] = max(results["times"])
-            results["avg"] = sum(results["times"]) / len(results["times"])
+        if received > 0:
+            t = latencies[replied]
+            results["times"] = t.tolist()
+            results["min"] = float(t.min())
+            results["max"] = float(t.max())
+            results["avg"] = float(t.mean())
+            results["mdev"] = float(t.std(ddof=1)) if received > 1 else 0.0
             results["loss"] = (results["lost"] / results["sent"]) * 100
         
+        if debug:
+            log.debug("--- %s ping statistics --- %d packets transmitted, %d received, "
+                      "%.1f%% packet loss", source, count, received,
+                      results["lost"] * 100 / count if count else 0.0)
+            if received > 0:
+                log.debug("rtt min/avg/max/mdev = %.3f/%.3f/%.3f/%.3f ms", results["min"],
+                          results["avg"], results["max"], results["mdev"])
+        
         return results
@@ -16,13 +16,14 @@ def main():
     pc2 = Host("PC2")
     
     # Add devices to network
-    for device in [router, switch, pc1, pc2]:
-        network.add_device(device)
+    network.add_devices([router, switch, pc1, pc2])
     
     # Connect devices
-    network.connect_devices("R1", "eth0", "SW1", "eth1")
-    network.connect_devices("SW1", "eth2", "PC1", "eth0")
-    network.connect_devices("SW1", "eth3", "PC2", "eth0")
+    network.connect_devices_bulk([
+        ("R1", "eth0", "SW1", "eth1"),
+        ("SW1", "eth2", "PC1", "eth0"),
+        ("SW1", "eth3", "PC2", "eth0"),
+    ])
     
     # Draw the network
     output_file = "simple_network.png"
@@ -1,6 +1,9 @@
+import os
+import re
 import pytest
 from network_simulator.network import NetworkTopology
 from network_simulator.device import Router, Switch, Host
+from network_simulator.graph import AdjGraph
 
 class TestNetworkTopology:
     def setup_method(self):
@@ -19,6 +22,26 @@ class TestNetworkTopology:
         assert "SW1" in self.network.devices
         assert "PC1" in self.network.devices
 
+    def test_add_devices(self):
+        self.network.add_devices([Router("R2"), Host("PC2")])
+        assert len(self.network.devices) == 5
+        assert self.network.graph.nodes["PC2"]["type"] == "host"
+
+        with pytest.raises(ValueError):
+            self.network.add_devices([Host("PC3"), Host("PC1")])
+        assert "PC3" not in self.network.devices
+
+    def test_connect_devices_bulk(self):
+        self.network.connect_devices_bulk([
+            ("R1", "eth0", "SW1", "eth1", {"bandwidth": 1000}),
+            ("SW1", "eth2", "PC1", "eth0"),
+        ])
+
+        assert self.network.graph.has_edge("R1", "SW1")
+        assert self.network.get_shortest_path("R1", "PC1") == ["R1", "SW1", "PC1"]
+        with pytest.raises(ValueError):
+            self.network.connect_devices_bulk([("R1", "eth1", "R9", "eth0")])
+
     def test_connect_devices(self):
         self.network.connect_devices("R1", "eth0", "SW1", "eth1")
         self.network.connect_devices("SW1", "eth2", "PC1", "eth0")
@@ -27,6 +50,24 @@ class TestNetworkTopology:
         assert self.network.graph.has_edge("SW1", "PC1")
         assert not self.network.graph.has_edge("R1", "PC1")
 
+    def test_get_interface(self):
+        self.network.connect_devices("R1", "eth0", "SW1", "eth1")
+
+        assert self.network.get_interface("R1", "eth0") is self.router.interfaces["eth0"]
+        assert self.network.get_interface("SW1", "eth1").connected_to == "R1"
+        assert self.network.get_interface("R1", "eth9") is None
+
+        self.network.remove_device("SW1")
+        assert self.network.get_interface("SW1", "eth1") is None
+
+    def test_assign_ip_addresses_after_interface_replaced(self):
+        self.network.connect_devices("R1", "eth0", "SW1", "eth1")
+        self.router.add_interface("eth0", mac_address="00:00:00:00:00:01")
+        self.network.assign_ip_addresses()
+
+        assert self.router.interfaces["eth0"].ip_address == "192.168.1.1"
+        assert self.network.get_interface("R1", "eth0") is self.router.interfaces["eth0"]
+
     def test_shortest_path(self):
         self.network.connect_devices("R1", "eth0", "SW1", "eth1")
         self.network.connect_devices("SW1", "eth2", "PC1", "eth0")
@@ -34,11 +75,102 @@ class TestNetworkTopology:
         path = self.network.get_shortest_path("R1", "PC1")
         assert path == ["R1", "SW1", "PC1"]
 
+    def test_shortest_path_disconnected(self):
+        self.network.connect_devices("R1", "eth0", "SW1", "eth1")
+
+        assert self.network.get_shortest_path("R1", "PC1") is None
+        assert self.network.get_shortest_path("PC1", "PC1") == ["PC1"]
+
+    def test_shortest_path_cache_invalidated_on_connect(self):
+        self.network.connect_devices("R1", "eth0", "SW1", "eth1")
+        assert self.network.get_shortest_path("PC1", "R1") is None
+
+        self.network.connect_devices("SW1", "eth2", "PC1", "eth0")
+        assert self.network.get_shortest_path("R1", "PC1") == ["R1", "SW1", "PC1"]
+        assert self.network.get_shortest_path("PC1", "R1") == ["PC1", "SW1", "R1"]
+
+    def test_shortest_path_picks_shorter_branch(self):
+        self.network.add_device(Router("R2"))
+        self.network.add_device(Switch("SW2"))
+        self.network.connect_devices("R1", "eth0", "SW1", "eth1")
+        self.network.connect_devices("SW1", "eth2", "PC1", "eth0")
+        self.network.connect_devices("R1", "eth1", "R2", "eth0")
+        self.network.connect_devices("R2", "eth1", "SW2", "eth0")
+        self.network.connect_devices("SW2", "eth1", "PC1", "eth1")
+
+        assert self.network.get_shortest_path("R1", "PC1") == ["R1", "SW1", "PC1"]
+        assert self.network.get_shortest_path("R2", "PC1") == ["R2", "SW2", "PC1"]
+
+    def test_generate_ip_address(self):
+        base = (192 << 24) | (168 << 16) | (1 << 8)
+        assert self.network._generate_ip_address(base, 1) == "192.168.1.1"
+        assert self.network._generate_ip_address(base, 12) == "192.168.1.12"
+
+    def test_assign_ip_addresses(self):
+        self.network.add_device(Host("PC2"))
+        self.network.connect_devices("R1", "eth0", "SW1", "eth1")
+        self.network.connect_devices("SW1", "eth2", "PC1", "eth0")
+        self.network.connect_devices("SW1", "eth3", "PC2", "eth0")
+        self.network.assign_ip_addresses()
+        self.network.assign_ip_addresses()
+
+        r1_eth0 = self.router.interfaces["eth0"]
+        assert r1_eth0.ip_address == "192.168.1.1"
+        assert r1_eth0.connected_to == "SW1"
+        assert self.switch.interfaces["eth1"].ip_address == "192.168.1.2"
+        host_ips = {self.network.devices[name].interfaces["eth0"].ip_address
+                    for name in ("PC1", "PC2")}
+        assert host_ips == {"192.168.1.10", "192.168.1.11"}
+
     def test_remove_device(self):
         self.network.remove_device("PC1")
         assert "PC1" not in self.network.devices
         assert len(self.network.devices) == 2
 
+    def test_node_ids_are_stable(self):
+        assert self.network.node_id == {"R1": 0, "SW1": 1, "PC1": 2}
+        self.network.remove_device("SW1")
+        self.network.add_devices([Host("PC2"), Switch("SW1")])
+        assert self.network.node_id["SW1"] == 1
+        assert self.network.node_names[self.network.node_id["PC2"]] == "PC2"
+
+class TestDrawTopologyPyvis:
+    def setup_method(self):
+        self.network = NetworkTopology("Test Network")
+        self.network.add_devices([Router("R1"), Switch("SW1"), Host("PC1")])
+        self.network.connect_devices_bulk([
+            ("R1", "eth0", "SW1", "eth0"),
+            ("SW1", "eth1", "PC1", "eth0"),
+        ])
+
+    def test_writes_html_with_device_shapes(self, tmp_path):
+        pytest.importorskip("pyvis")
+        filename = tmp_path / "net.html"
+        self.network.draw_topology(str(filename), backend="pyvis")
+
+        html = filename.read_text()
+        for shape in ("square", "hexagon", "triangle"):
+            assert f'"shape": "{shape}"' in html
+        assert re.search(r'"physics": \{\s*"enabled": true', html)
+        assert [path.name for path in tmp_path.iterdir()] == ["net.html"]
+        assert not os.path.exists("lib")
+
+    def test_disables_physics_for_large_topologies(self, tmp_path):
+        pytest.importorskip("pyvis")
+        self.network.add_devices([Host(f"H{i}") for i in range(100)])
+        filename = tmp_path / "net.html"
+        self.network.draw_topology(str(filename), backend="pyvis")
+
+        assert re.search(r'"physics": \{\s*"enabled": false', filename.read_text())
+
+    def test_requires_filename(self):
+        with pytest.raises(ValueError):
+            self.network.draw_topology(backend="pyvis")
+
+    def test_unknown_backend(self, tmp_path):
+        with pytest.raises(ValueError):
+            self.network.draw_topology(str(tmp_path / "net.html"), backend="svg")
+
 class TestDevice:
     def test_router_initialization(self):
         router = Router("R1")
@@ -57,3 +189,33 @@ class TestDevice:
         assert host.name == "PC1"
         assert host.device_type == "host"
         assert hasattr(host, 'running_processes')
+
+    def test_interface_status(self):
+        router = Router("R1")
+        router.add_interface("eth0", ip_address="10.0.0.1", subnet_mask="24")
+        assert router.interfaces["eth0"].status == "down"
+        assert router.set_interface_status("eth0", "UP")
+        assert router.interfaces["eth0"].status == "up"
+        assert router.interfaces["eth0"].ip_address == "10.0.0.1"
+        assert not router.set_interface_status("eth1", "up")
+
+class TestAdjGraph:
+    def test_edges_keep_link_orientation_and_attrs(self):
+        graph = AdjGraph()
+        graph.add_edge("SW1", "PC1", interface1="eth2", interface2="eth0", bandwidth=100)
+
+        assert graph.has_edge("PC1", "SW1")
+        assert graph.edges(data=True) == [
+            ("SW1", "PC1", {"interface1": "eth2", "interface2": "eth0", "bandwidth": 100})
+        ]
+        assert graph.number_of_edges() == 1
+
+    def test_remove_node_drops_links(self):
+        graph = AdjGraph()
+        graph.add_edge("R1", "SW1")
+        graph.add_edge("SW1", "PC1")
+        graph.remove_node("SW1")
+
+        assert graph.number_of_edges() == 0
+        assert list(graph.neighbors("R1")) == []
+        assert graph.nodes() == ["R1", "PC1"]
@@ -0,0 +1,136 @@
+import json
+import logging
+import pytest
+from network_simulator.network import NetworkTopology
+from network_simulator.device import Router, Switch, Host
+from network_simulator.simulation import NetworkSimulation, Packet, PacketType
+
+class TestNetworkSimulation:
+    def setup_method(self):
+        self.network = NetworkTopology("Test Network")
+        self.network.add_devices([Router("R1"), Switch("SW1"), Switch("SW2"),
+                                  Host("PC1"), Host("PC2")])
+        self.network.connect_devices_bulk([
+            ("R1", "eth0", "SW1", "eth0"),
+            ("R1", "eth1", "SW2", "eth0"),
+            ("SW1", "eth1", "PC1", "eth0"),
+            ("SW2", "eth1", "PC2", "eth0"),
+        ])
+        self.sim = NetworkSimulation(self.network)
+        self.sim.packet_loss_rate = 0
+
+    def test_send_packet_requires_running(self):
+        assert not self.sim.send_packet(Packet("PC1", "PC2", PacketType.TCP))
+        assert self.sim.traffic_stats['sent'] == 0
+
+    def test_send_packet_is_delivered_along_shortest_path(self):
+        self.sim.start()
+        packet = Packet("PC1", "PC2", PacketType.TCP)
+        assert self.sim.send_packet(packet)
+        self.sim.run(1)
+
+        assert packet.path == ["PC1", "SW1", "R1", "SW2", "PC2"]
+        assert packet.ttl == 60
+        assert self.sim.traffic_stats['received'] == 1
+        assert packet.to_dict()['latency'] == self.sim.stats.latency_sum > 0
+        assert self.sim.traffic_stats['avg_latency'] == self.sim.stats.latency_sum
+        assert self.sim.virtual_time == pytest.approx(1)
+
+    def test_traffic_stats_is_read_only(self):
+        with pytest.raises(TypeError):
+            self.sim.traffic_stats['sent'] += 1
+        assert self.sim.stats.sent == 0
+
+    def test_send_payload(self):
+        self.sim.start()
+        assert self.sim.send_payload("PC1", "R1", b"data")
+        self.sim.run(1)
+        assert self.sim.traffic_stats['sent'] == 1
+        assert self.sim.traffic_stats['received'] == 1
+
+    def test_ping(self):
+        results = self.sim.ping("PC1", "PC2", count=3)
+        assert results["sent"] == 3
+        assert results["received"] == 3
+        assert results["path"] == ["PC1", "SW1", "R1", "SW2", "PC2"]
+        assert results["min"] <= results["avg"] <= results["max"]
+
+    def test_ping_negative_count(self):
+        with pytest.raises(ValueError):
+            self.sim.ping("PC1", "PC2", count=-1)
+
+    def test_ping_unknown_device(self):
+        assert "error" in self.sim.ping("PC1", "PC9")
+
+    def test_ping_verbose_collects_reply_lines(self):
+        assert "log" not in self.sim.ping("PC1", "PC2", count=2)
+        results = self.sim.ping("PC1", "PC2", count=2, verbose=True)
+        assert len(results["log"]) == 2
+        assert results["log"][0].startswith("Reply from PC2")
+
+    def test_ping_zero_count_with_debug_logging(self, caplog):
+        with caplog.at_level(logging.DEBUG, logger="network_simulator.simulation"):
+            results = self.sim.ping("PC1", "PC2", count=0)
+        assert results["sent"] == 0
+        assert "0.0% packet loss" in caplog.text
+
+    def test_clock_never_runs_backwards(self):
+        dispatch_times = []
+        dispatch = self.sim._dispatch
+
+        def record(packet):
+            dispatch_times.append(self.sim.virtual_time)
+            return dispatch(packet)
+
+        self.sim._dispatch = record
+        self.sim.start()
+        packet = Packet("PC1", "PC2", PacketType.TCP)
+        assert self.sim.send_packet(packet)
+        self.sim.ping("PC1", "PC2", count=10)
+        ping_end = self.sim.virtual_time
+        self.sim.send_packet(Packet("PC2", "PC1", PacketType.TCP))
+        self.sim.run(0.5)
+
+        assert dispatch_times == sorted(dispatch_times)
+        assert packet.path == ["PC1", "SW1", "R1", "SW2", "PC2"]
+        assert self.sim.traffic_stats['received'] == 2
+        assert self.sim.virtual_time == pytest.approx(ping_end + 0.5)
+
+    def test_send_batch(self):
+        self.sim.start()
+        packets = [Packet("PC1", "PC2", PacketType.UDP) for _ in range(5)]
+        packets.append(Packet("PC2", "PC9", PacketType.UDP))
+        assert self.sim.send_batch(packets) == 5
+        self.sim.run(1)
+
+        assert self.sim.traffic_stats['sent'] == 5
+        assert self.sim.traffic_stats['received'] == 5
+        assert [p.sequence for p in packets[:5]] == [1, 2, 3, 4, 5]
+        assert all(p.path == ["PC1", "SW1", "R1", "SW2", "PC2"] for p in packets[:5])
+
+    def test_next_hop_matrix_built_only_for_batches(self):
+        self.sim.start()
+        assert self.sim.send_packet(Packet("PC1", "PC2", PacketType.TCP))
+        assert self.sim._nexthop_arr is None
+
+        self.sim.send_batch([Packet("PC1", "PC2", PacketType.TCP)])
+        self.network.add_device(Host("PC3"))
+        self.network.connect_devices("SW2", "eth2", "PC3", "eth0")
+        assert self.sim.send_batch([Packet("PC1", "PC3", PacketType.TCP)]) == 1
+        assert self.sim._nexthop_arr.shape == (6, 6)
+
+
+class TestPacket:
+    def test_add_hop_detects_loops_and_ttl_expiry(self):
+        packet = Packet("PC1", "PC2", PacketType.TCP, ttl=2)
+        packet.start(0, ["PC1", "SW1", "R1", "SW2"])
+        assert packet.add_hop(1)
+        assert not packet.add_hop(0)
+        assert not packet.add_hop(2)
+        assert packet.path == ["PC1", "SW1", "R1"]
+        assert packet.ttl == 0
+
+    def test_to_json_matches_to_dict(self):
+        packet = Packet("PC1", "PC2", PacketType.ICMP_ECHO, sequence=3)
+        assert json.loads(packet.to_json()) == packet.to_dict()
+        assert packet.to_dict()["type"] == "ICMP_ECHO"